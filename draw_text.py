@@ -1,49 +1,101 @@
+import micropython
+
+# For every possible glyph column byte, the row offsets (from the top of
+# the 8-pixel-tall, LSB-first glyph) whose bits are set. Built once at
+# import; the render loop then iterates only over lit pixels instead of
+# shifting and testing all 8 bits of every column.
+_BIT_ROWS = tuple(
+    tuple(7 - row for row in range(8) if (col >> row) & 1)
+    for col in range(256)
+)
+
+# Per-glyph blit cache: for each glyph bitmap, the flat tuple of
+# (dx, dy) lit-pixel offsets, built on first use via _BIT_ROWS. Keyed by
+# the glyph bytes themselves so every font shares one cache; the clock
+# only ever shows a dozen or so distinct glyphs, so it stays tiny.
+_GLYPH_OFFSETS = {}
+
+# Last-glyph cache. A clock redraws the same few characters every frame,
+# so remembering the previous lookup skips the font dict hash for
+# repeated glyphs (e.g. the digits and separator of the time string).
+# Keyed by the font as well as the character — the same character lives
+# in all three fonts with different glyphs.
+_glyph_font = None
+_glyph_char = None
+_glyph_data = None
+_glyph_offs = None
+
+# native emits machine code for the loop/dispatch overhead while keeping
+# ordinary object semantics. viper with ptr8 would need a single flat
+# framebuffer to poke; pixels here fan out into three 1-bit-per-channel
+# planes through set_pixel_value, so native is the step that fits.
+@micropython.native
 def draw_text(matrix_data_object, font_data, text, x=0, y=0, color=7):
     """
-    Draws text onto a 2D list (buffer) by parsing the new font data structure.
+    Draws text directly into the MatrixData planes.
 
     Args:
         matrix_data_object: The MatrixData object to draw on.
-        font_data: A dictionary where characters are mapped to lists of integers
-                   representing bit-mapped columns.
+        font_data: A dictionary where characters are mapped to bytes of
+                   bit-mapped columns.
         text: The string to display.
         x: The starting x-coordinate.
         y: The starting y-coordinate.
         color: The integer value representing the color.
+
+    Returns:
+        The cursor x-coordinate after the last character, so callers
+        can tell how wide the rendered text actually was.
     """
-    # Create an empty 2D list to serve as our drawing buffer.
-    # We use 0 as the default value since the library expects integers for colors.
-    buffer = [[0 for _ in range(matrix_data_object.col_size)] for _ in range(matrix_data_object.row_size)]
-    
     cursor_x = x
-    
+
+    # Hoist size, table and method lookups out of the pixel loops.
+    col_size = matrix_data_object.col_size
+    row_size = matrix_data_object.row_size
+    set_pixel_value = matrix_data_object.set_pixel_value
+
+    global _glyph_font, _glyph_char, _glyph_data, _glyph_offs
+
     # Iterate through each character in the input string
     for char in text:
-        if char in font_data:
-            # The pixel data is a list of integers, where each integer represents a column.
-            char_data = font_data[char]
-            
-            # Iterate through each column of the character's bitmap data
-            for col_index, col_data in enumerate(char_data):
-                pixel_x = cursor_x + col_index
-                
-                # Iterate through each bit (row) in the column data.
-                # The font is 8 bits high. We'll iterate in reverse to correct the vertical inversion.
-                for row_index in range(8):
-                    pixel_y = y + (7 - row_index)
-                    
-                    # Check if the bit is set (i.e., the pixel should be on).
-                    # The font data from the provided URL is LSB-first.
-                    if (col_data >> row_index) & 1:
-                        # Set the pixel on our temporary buffer to the integer color value.
-                        if 0 <= pixel_x < matrix_data_object.col_size and 0 <= pixel_y < matrix_data_object.row_size:
-                            buffer[pixel_y][pixel_x] = color
-            
+        # Check the one-glyph cache first; a repeated character from the
+        # same font skips both the font dict and the blit-cache lookup.
+        if char == _glyph_char and font_data is _glyph_font:
+            char_data = _glyph_data
+            offsets = _glyph_offs
+        else:
+            char_data = font_data.get(char)
+            offsets = None
+            if char_data is not None:
+                offsets = _GLYPH_OFFSETS.get(char_data)
+                if offsets is None:
+                    # First time this glyph is drawn: flatten its lit
+                    # pixels to (dx, dy) offsets via _BIT_ROWS, which
+                    # already corrects the vertical inversion of the
+                    # LSB-first font.
+                    offsets = tuple((dx, dy)
+                                    for dx, col_data in enumerate(char_data)
+                                    for dy in _BIT_ROWS[col_data])
+                    _GLYPH_OFFSETS[char_data] = offsets
+            _glyph_font = font_data
+            _glyph_char = char
+            _glyph_data = char_data
+            _glyph_offs = offsets
+
+        if char_data is not None:
+            # One tight loop over the glyph's lit pixels — no per-column
+            # enumerate or table indexing left on the hot path. Pixels go
+            # straight into the matrix planes.
+            for dx, dy in offsets:
+                pixel_x = cursor_x + dx
+                pixel_y = y + dy
+                if 0 <= pixel_x < col_size and 0 <= pixel_y < row_size:
+                    set_pixel_value(pixel_y, pixel_x, color)
+
             # Move the cursor to the next character's position, plus a space
             cursor_x += len(char_data) + 1
         else:
             # If the character is not in the font, move the cursor for a space
             cursor_x += 3
-            
-    # Finally, send the entire buffer to the physical display in one go.
-    matrix_data_object.set_pixels(0, 0, buffer)
\ No newline at end of file
+
+    return cursor_x
@@ -5,6 +5,17 @@
 # to prevent timeout issues often seen on certain microcontrollers.
 
 import machine
+from micropython import const
+
+# The default I2C address for the DS1307, folded into bytecode via
+# const() on the hot read/write paths. The bus scanner confirmed this
+# is the correct address for your module.
+_ADDR = const(0x68)
+
+# Precomputed BCD -> integer table, built once at import time.
+# A single indexed load replaces the shift/mask/multiply/add sequence
+# that _bcd_to_int performs in bytecode for each of the 7 time fields.
+_BCD2INT = bytes(((b >> 4) * 10 + (b & 0x0F)) & 0xFF for b in range(256))
 
 class DS1307:
     """
@@ -20,9 +31,9 @@ class DS1307:
     The driver communicates with the DS1307 via the I2C bus.
     """
     
-    # The default I2C address for the DS1307.
-    # The bus scanner confirmed this is the correct address for your module.
-    ADDRESS = 0x68
+    # The default I2C address for the DS1307 (kept as a class attribute
+    # for external callers; internal code uses the const'd _ADDR).
+    ADDRESS = _ADDR
     
     def __init__(self, i2c):
         """
@@ -32,6 +43,12 @@ class DS1307:
         """
         self.i2c = i2c
 
+        # Preallocated I2C buffers, reused by datetime() so a 1 Hz clock
+        # read/write never allocates (allocation triggers GC sweeps on
+        # MicroPython's fixed heap).
+        self._read_buf = bytearray(7)
+        self._write_buf = bytearray(8)  # register address byte + 7 fields
+
     def _bcd_to_int(self, bcd):
         """
         Converts BCD (Binary-Coded Decimal) to an integer.
@@ -40,7 +57,7 @@ class DS1307:
         represents a single decimal digit. This function converts a BCD byte
         into a standard integer.
         """
-        return (bcd & 0x0F) + ((bcd >> 4) * 10)
+        return _BCD2INT[bcd]
 
     def _int_to_bcd(self, integer):
         """
@@ -71,41 +88,45 @@ class DS1307:
             # Read all 7 time registers from the RTC starting at address 0.
             # We add a try/except block here to catch any I2C communication errors.
             try:
-                buf = self.i2c.readfrom_mem(self.ADDRESS, 0x00, 7)
+                buf = self._read_buf
+                self.i2c.readfrom_mem_into(_ADDR, 0x00, buf)
             except OSError as e:
                 # If there's a timeout or other I2C error, raise a more descriptive error.
                 raise OSError(f"DS1307 read failed: {e}. Check wiring and I2C pull-up resistors.")
             
-            # Extract and convert each BCD value to an integer.
-            seconds = self._bcd_to_int(buf[0] & 0x7F) # Mask off the CH (Clock Halt) bit.
-            minutes = self._bcd_to_int(buf[1])
-            hours = self._bcd_to_int(buf[2] & 0x3F)  # Mask off the 12/24 hour format bit if needed.
-            weekday = self._bcd_to_int(buf[3])
-            day = self._bcd_to_int(buf[4])
-            month = self._bcd_to_int(buf[5])
-            year = self._bcd_to_int(buf[6]) + 2000
-            
+            # Mask the flag bits in place (the buffer is ours), then build
+            # the result tuple in one expression via the lookup table with
+            # no intermediate locals.
+            buf[0] &= 0x7F  # Mask off the CH (Clock Halt) bit.
+            buf[2] &= 0x3F  # Mask off the 12/24 hour format bit if needed.
+
             # Return the date/time tuple. Milliseconds are always 0 as the DS1307 doesn't support them.
-            return (year, month, day, weekday, hours, minutes, seconds, 0)
+            return (_BCD2INT[buf[6]] + 2000,  # year
+                    _BCD2INT[buf[5]],         # month
+                    _BCD2INT[buf[4]],         # day
+                    _BCD2INT[buf[3]],         # weekday
+                    _BCD2INT[buf[2]],         # hours
+                    _BCD2INT[buf[1]],         # minutes
+                    _BCD2INT[buf[0]],         # seconds
+                    0)
         
         else:
             # If a datetime tuple is provided, write the new time to the RTC.
-            # Convert each integer to BCD before writing.
-            year = self._int_to_bcd(dt[0] - 2000)
-            month = self._int_to_bcd(dt[1])
-            day = self._int_to_bcd(dt[2])
-            weekday = self._int_to_bcd(dt[3])
-            hours = self._int_to_bcd(dt[4])
-            minutes = self._int_to_bcd(dt[5])
-            seconds = self._int_to_bcd(dt[6])
-            
-            # Construct the write buffer.
+            # Fill the preallocated write buffer with BCD values.
             # Note: The DS1307 requires a control byte for the first write.
             # The format is [register_address, seconds, minutes, ...].
-            buf = bytearray([0x00, seconds, minutes, hours, weekday, day, month, year])
-            
+            buf = self._write_buf
+            buf[0] = 0x00
+            buf[1] = self._int_to_bcd(dt[6])  # seconds
+            buf[2] = self._int_to_bcd(dt[5])  # minutes
+            buf[3] = self._int_to_bcd(dt[4])  # hours
+            buf[4] = self._int_to_bcd(dt[3])  # weekday
+            buf[5] = self._int_to_bcd(dt[2])  # day
+            buf[6] = self._int_to_bcd(dt[1])  # month
+            buf[7] = self._int_to_bcd(dt[0] - 2000)  # year
+
             try:
                 # Write the buffer to the RTC.
-                self.i2c.writeto(self.ADDRESS, buf)
+                self.i2c.writeto(_ADDR, buf)
             except OSError as e:
                 raise OSError(f"DS1307 write failed: {e}. Check wiring and I2C pull-up resistors.")
@@ -260,4 +260,13 @@ font_spectrum = {
 "z" : [0B00100010, 0B00100110, 0B00101010, 0B00110010, 0B00100010],
 "{" : [0B00010000, 0B00010000, 0B01101110, 0B01000010, 0B01000010],
 "|" : [0B01111110],
-"}" : [0B01000010, 0B01000010, 0B01101110, 0B00010000, 0B00010000],}
\ No newline at end of file
+"}" : [0B01000010, 0B01000010, 0B01101110, 0B00010000, 0B00010000],}
+
+# Convert every glyph's column list to an immutable bytes object once at
+# import time. bytes indexes and iterates like the original list but
+# packs a column per byte with no per-element object boxing, so the
+# renderer walks glyph columns without allocating.
+for _font in (font_8x5, font_digital, font_spectrum):
+    for _char in _font:
+        _font[_char] = bytes(_font[_char])
+del _font, _char
@@ -108,39 +108,53 @@ class Hub75Spi:
         -------
         None.
         '''
+        # Hoist attribute lookups out of the row loop; every dotted access
+        # costs a dict lookup per iteration on MicroPython.
+        red_data = self.matrix_data.red_matrix_data
+        green_data = self.matrix_data.green_matrix_data
+        blue_data = self.matrix_data.blue_matrix_data
+        red1_write = self.red1_spi.write
+        green1_write = self.green1_spi.write
+        blue1_write = self.blue1_spi.write
+        red1_mosi_off = self.red1_mosi_pin.off
+        green1_mosi_off = self.green1_mosi_pin.off
+        blue1_mosi_off = self.blue1_mosi_pin.off
+        latch_on = self.latch_pin.on
+        latch_off = self.latch_pin.off
+        oe_on = self.output_enable_pin.on
+        oe_off = self.output_enable_pin.off
+        illumination_time = self.config.illumination_time_microseconds
+
         for row in range(self.half_row_size):
             # shift in data
-            row_data = self.matrix_data.red_matrix_data[row]
-            self.red1_spi.write(row_data)
-            self.red1_mosi_pin.off()
-            self.output_enable_pin.on() # disable
+            red1_write(red_data[row])
+            red1_mosi_off()
+            oe_on() # disable
 
             self.set_row_select(row)
 
-            self.latch_pin.on()
-            self.latch_pin.off()
-            self.output_enable_pin.off() # enable
-            sleep_us(self.config.illumination_time_microseconds)
+            latch_on()
+            latch_off()
+            oe_off() # enable
+            sleep_us(illumination_time)
 
             # shift in data
-            row_data = self.matrix_data.green_matrix_data[row]
-            self.green1_spi.write(row_data)
-            self.green1_mosi_pin.off()
-            self.output_enable_pin.on() # disable
-            self.latch_pin.on()
-            self.latch_pin.off()
-            self.output_enable_pin.off() # enable
-            sleep_us(self.config.illumination_time_microseconds)
+            green1_write(green_data[row])
+            green1_mosi_off()
+            oe_on() # disable
+            latch_on()
+            latch_off()
+            oe_off() # enable
+            sleep_us(illumination_time)
 
             # shift in data
-            row_data = self.matrix_data.blue_matrix_data[row]
-            self.blue1_spi.write(row_data)
-            self.blue1_mosi_pin.off()
-            self.output_enable_pin.on() # disable
-            self.latch_pin.on()
-            self.latch_pin.off()
-            self.output_enable_pin.off() # enable
-            sleep_us(self.config.illumination_time_microseconds)
+            blue1_write(blue_data[row])
+            blue1_mosi_off()
+            oe_on() # disable
+            latch_on()
+            latch_off()
+            oe_off() # enable
+            sleep_us(illumination_time)
 
     def display_bottom_half(self):
         '''
@@ -150,43 +164,57 @@ class Hub75Spi:
         -------
         None.
         '''
-        for row in range(self.half_row_size, self.matrix_data.row_size):
+        # Same local hoisting as display_top_half.
+        red_data = self.matrix_data.red_matrix_data
+        green_data = self.matrix_data.green_matrix_data
+        blue_data = self.matrix_data.blue_matrix_data
+        red2_write = self.red2_spi.write
+        green2_write = self.green2_spi.write
+        blue2_write = self.blue2_spi.write
+        red2_mosi_off = self.red2_mosi_pin.off
+        green2_mosi_off = self.green2_mosi_pin.off
+        blue2_mosi_off = self.blue2_mosi_pin.off
+        latch_on = self.latch_pin.on
+        latch_off = self.latch_pin.off
+        oe_on = self.output_enable_pin.on
+        oe_off = self.output_enable_pin.off
+        illumination_time = self.config.illumination_time_microseconds
+        half_row_size = self.half_row_size
+
+        for row in range(half_row_size, self.matrix_data.row_size):
             # shift in data
-            row_data = self.matrix_data.red_matrix_data[row]
-            self.red2_spi.write(row_data)
-            self.red2_mosi_pin.off()
-            self.output_enable_pin.on() # disable
-
-            self.set_row_select(row % self.half_row_size)
-
-            self.latch_pin.on()
-            self.latch_pin.off()
-            self.output_enable_pin.off() # enable
-            sleep_us(self.config.illumination_time_microseconds)
-
-            row_data = self.matrix_data.green_matrix_data[row]
-            self.green2_spi.write(row_data)
-            self.green2_mosi_pin.off()
-            self.output_enable_pin.on() # disable
-            self.latch_pin.on()
-            self.latch_pin.off()
-            self.output_enable_pin.off() # enable
-            sleep_us(self.config.illumination_time_microseconds)
-
-            row_data = self.matrix_data.blue_matrix_data[row]
-            self.blue2_spi.write(row_data)
-            self.blue2_mosi_pin.off()
-            self.output_enable_pin.on() # disable
-            self.latch_pin.on()
-            self.latch_pin.off()
-            self.output_enable_pin.off() # enable
-            sleep_us(self.config.illumination_time_microseconds)
+            red2_write(red_data[row])
+            red2_mosi_off()
+            oe_on() # disable
+
+            self.set_row_select(row % half_row_size)
+
+            latch_on()
+            latch_off()
+            oe_off() # enable
+            sleep_us(illumination_time)
+
+            green2_write(green_data[row])
+            green2_mosi_off()
+            oe_on() # disable
+            latch_on()
+            latch_off()
+            oe_off() # enable
+            sleep_us(illumination_time)
+
+            blue2_write(blue_data[row])
+            blue2_mosi_off()
+            oe_on() # disable
+            latch_on()
+            latch_off()
+            oe_off() # enable
+            sleep_us(illumination_time)
 
         # flush out last blue line
         self.blue2_spi.write(bytearray(self.matrix_data.col_bytes))
-        self.output_enable_pin.on()
-        self.latch_pin.on()
-        self.latch_pin.off()
+        oe_on() # disable
+        latch_on()
+        latch_off()
 
     def display_data(self):
         '''
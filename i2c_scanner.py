@@ -5,29 +5,44 @@ import machine
 import sys
 import time
 
-def scan_i2c_bus():
+# Memoized result of the last successful scan. The bus topology doesn't
+# change at runtime, so repeated calls (e.g. from RTC fault recovery)
+# shouldn't re-initialize the peripheral and re-scan every time.
+_scan_cache = None
+
+def scan_i2c_bus(i2c=None, force=False):
     """
     Scans the I2C bus for connected devices.
     Returns a list of addresses of found devices.
+
+    An already-initialized I2C object can be passed in to avoid
+    re-initializing the peripheral; results are cached for the session
+    unless force=True.
     """
+    global _scan_cache
+    if _scan_cache is not None and not force:
+        return _scan_cache
+
     print("Scanning I2C bus...")
     try:
-        # Initialize the I2C bus with the specified pins.
-        # This should match the pins used for your RTC.
-        # The ESP32 can have multiple I2C buses (0 or 1), so we specify bus 0.
-        i2c = machine.I2C(0, scl=machine.Pin(13), sda=machine.Pin(14))
-        
+        if i2c is None:
+            # Initialize the I2C bus with the specified pins.
+            # This should match the pins used for your RTC.
+            # The ESP32 can have multiple I2C buses (0 or 1), so we specify bus 0.
+            i2c = machine.I2C(0, scl=machine.Pin(13), sda=machine.Pin(14))
+
         # Scan for devices on the bus.
         devices = i2c.scan()
         
         if not devices:
             print("No I2C devices found.")
         else:
-            print(f"Found {len(devices)} I2C devices:")
-            for device in devices:
-                # The address is in decimal, so we convert it to hex for readability.
-                print(f"  - Device found at address: 0x{hex(device)}")
-        
+            # Print a single summary line instead of one line per device;
+            # each print is a blocking UART write, so keep them out of loops.
+            print("Found {} I2C devices: {}".format(
+                len(devices), ", ".join(hex(device) for device in devices)))
+
+        _scan_cache = devices
         return devices
         
     except Exception as e:
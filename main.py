@@ -10,24 +10,29 @@ import time
 from font import font_spectrum
 from draw_text import draw_text
 import dht
+import gc
 import json
 import network
 import socket
 import machine
+import os
+import uselect
+from micropython import const
 
-# Define the size of your matrix.
-ROW_SIZE = 32
-COL_SIZE = 64
+# Define the size of your matrix. const() folds these into the bytecode
+# wherever this module reads them, instead of a globals-dict lookup.
+ROW_SIZE = const(32)
+COL_SIZE = const(64)
 
 # Color Palette
-COLOR_RED = 1
-COLOR_GREEN = 2
-COLOR_BLUE = 4
-COLOR_CYAN = 6
-COLOR_WHITE = 7 # Color ID 7 is White (R=1, G=1, B=1)
+COLOR_RED = const(1)
+COLOR_GREEN = const(2)
+COLOR_BLUE = const(4)
+COLOR_CYAN = const(6)
+COLOR_WHITE = const(7) # Color ID 7 is White (R=1, G=1, B=1)
 
 # Define the pin for the DHT22 sensor.
-DHT22_PIN = 23
+DHT22_PIN = const(23)
 
 # Initialize the Hub75 configuration and matrix data.
 config = hub75.Hub75SpiConfiguration()
@@ -35,20 +40,31 @@ config = hub75.Hub75SpiConfiguration()
 matrix = matrixdata.MatrixData(ROW_SIZE, COL_SIZE)
 hub75spi = hub75.Hub75Spi(matrix, config)
 
-# Variables for timing the sensor reads
-last_update = 0
-last_owm_update = 0
-UPDATE_INTERVAL_MS = 5000  # 2 seconds in milliseconds
-OWM_UPDATE_INTERVAL_MS = 60000  # 10 minutes in milliseconds
+# Deadline (ticks_ms) for the next weather fetch; 0 fetches immediately
+# once connected.
+next_owm_deadline = 0
+# Consecutive failed fetches, drives exponential backoff (capped below).
+owm_failures = 0
+OWM_BACKOFF_MAX_MS = const(3600000)  # never back off for more than an hour
+UPDATE_INTERVAL_MS = const(5000)  # 2 seconds in milliseconds
+OWM_UPDATE_INTERVAL_MS = const(60000)  # 10 minutes in milliseconds
 display_text = "Reading..."  # Initial text to display
 
 # Wi-Fi Configuration Constants
 WIFI_CONFIG_FILE = "wifi_config.json"
+OWM_CACHE_FILE = "owm_cache.json"  # last good weather result + timestamp
 AP_SSID = "HUB75 Config"
 AP_PASSWORD = "password123" 
 
 device_config = {}
 sta_server_socket = None
+sta_poller = None
+
+# Interface singletons. network.WLAN() hands back the same underlying
+# interface on every call, but each call still pays the module lookup
+# and constructor dispatch, so grab each one once at import.
+sta_if = network.WLAN(network.STA_IF)
+ap_if = network.WLAN(network.AP_IF)
 
 owm_data = {"temp": None, "city": "N/A"}
 room_temp = 0.0
@@ -60,21 +76,12 @@ ip_address = "---"
 combined_display_text = "Fetching Data..." 
 
 # --- HTML GENERATOR ---
-def get_config_html(config):
-    """
-    Generates the ultra-minimal HTML configuration page, pre-filling current settings.
-    Uses 'owm_city_name' field.
-    """
-    
-    # Get current values, using defaults if they don't exist in the config object
-    ssid_val = config.get('ssid', '')
-    owm_key_val = config.get('owm_key', '')
-    # Use the updated config key
-    owm_city_name_val = config.get('owm_city_name', '') 
-    owm_units_val = config.get('owm_units', 'imperial')
-    
-    # Ultra-minimal HTML to minimize memory footprint and socket errors
-    html = """<!DOCTYPE html>
+
+# Ultra-minimal HTML to minimize memory footprint and socket errors.
+# Pre-encoded to bytes once at import; the %s slots are filled with the
+# current IP and config values at request time, so serving a page never
+# re-encodes the static 95% of the template.
+_CONFIG_HTML_TMPL = b"""<!DOCTYPE html>
 <html>
 <head>
     <meta name="viewport" content="width=device-width, initial-scale=1">
@@ -82,72 +89,220 @@ def get_config_html(config):
 </head>
 <body style="text-align: center;">
     <h1>Hub75 Setup</h1>
-    <p>Current IP: {ip_addr}</p>
+    <p>Current IP: %s</p>
     <form method="POST">
         <h2>WiFi Configuration</h2>
         <label for="ssid">SSID:</label><br>
-        <input type="text" name="ssid" value="{ssid_val}" required><br><br>
+        <input type="text" name="ssid" value="%s" required><br><br>
 
         <label for="password">Password:</label><br>
         <input type="password" name="password" required><br><br>
-        
+
         <h2>OpenWeatherMap</h2>
         <label for="owm_key">API Key:</label><br>
-        <input type="text" name="owm_key" value="{owm_key_val}"><br><br>
+        <input type="text" name="owm_key" value="%s"><br><br>
 
         <label for="owm_city_name">City Name (e.g., London,UK):</label><br>
-        <input type="text" name="owm_city_name" value="{owm_city_name_val}"><br><br>
-        
+        <input type="text" name="owm_city_name" value="%s"><br><br>
+
         <label for="owm_units">Units (imperial/metric):</label><br>
-        <input type="text" name="owm_units" value="{owm_units_val}"><br><br>
-        
+        <input type="text" name="owm_units" value="%s"><br><br>
+
         <button type="submit" style="background-color: green; color: white;">Save and Reboot</button>
     </form>
 </body>
 </html>
-""".format(
-    ip_addr=ip_address,
-    ssid_val=ssid_val,
-    owm_key_val=owm_key_val,
-    owm_city_name_val=owm_city_name_val, # Updated variable name
-    owm_units_val=owm_units_val
-)
-    return html
+"""
+
+# Static template segments, split once at import. The page is streamed
+# segment by segment so the full response never exists in RAM at once.
+_CONFIG_HTML_PARTS = _CONFIG_HTML_TMPL.split(b'%s')
+
+def _config_html_values(config):
+    """Returns the encoded values for the template slots, in order."""
+    return (
+        ip_address.encode(),
+        config.get('ssid', '').encode(),
+        config.get('owm_key', '').encode(),
+        config.get('owm_city_name', '').encode(),
+        config.get('owm_units', 'imperial').encode(),
+    )
+
+def get_config_html(config):
+    """
+    Generates the ultra-minimal HTML configuration page as bytes,
+    pre-filling current settings. Uses 'owm_city_name' field.
+    """
+    values = _config_html_values(config)
+    parts = [_CONFIG_HTML_PARTS[0]]
+    for i, value in enumerate(values):
+        parts.append(value)
+        parts.append(_CONFIG_HTML_PARTS[i + 1])
+    return b''.join(parts)
+
+# Config form fields, in save_wifi_config argument order. Both POST
+# handlers merge the form over the current config by walking this tuple
+# instead of repeating five get-with-fallback lines each.
+_CONFIG_FIELDS = ('ssid', 'password', 'owm_key', 'owm_city_name', 'owm_units')
+
+# Fixed responses, encoded once at import; the POST paths just sendall
+# these instead of concatenating and encoding strings per request. Each
+# carries a Content-Length and Connection: close so the browser can
+# render the page the moment it arrives instead of waiting on the
+# socket teardown to delimit it.
+def _static_response(status, body):
+    return (b'HTTP/1.1 ' + status +
+            b'\r\nContent-Type: text/html\r\nContent-Length: %d'
+            b'\r\nConnection: close\r\n\r\n' % len(body)) + body
+
+_RESP_SAVED_REBOOT = _static_response(
+    b'200 OK',
+    b'<h1>Configuration saved!</h1><p>The device is rebooting to apply changes.</p>')
+_RESP_CREDS_SAVED = _static_response(
+    b'200 OK',
+    b'<h1>Credentials saved!</h1><p>The device is rebooting to connect.</p>')
+_RESP_BAD_REQUEST = _static_response(
+    b'400 Bad Request',
+    b'<h1>Missing SSID or Password</h1>')
+
+# Fully rendered 200 response (header + page), memoized between requests.
+# The page only changes when the configuration or our IP does, so repeat
+# GETs are a single sendall of a prebuilt buffer with no re-rendering.
+# Keyed by the rendered values rather than an explicit invalidation hook
+# so the AP portal and the STA server stay correct with their own config
+# dicts, and a save naturally refreshes the cache on the next GET.
+_config_response = None
+_config_response_key = None
+
+def send_config_html(conn, config):
+    """
+    Sends the config page from the memoized response buffer, rebuilding
+    it only when the rendered values have changed since the last request.
+    """
+    global _config_response, _config_response_key
+    values = _config_html_values(config)
+    if values != _config_response_key:
+        body = get_config_html(config)
+        _config_response = (
+            b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: %d\r\n\r\n'
+            % len(body)
+        ) + body
+        _config_response_key = values
+    conn.sendall(_config_response)
 
 # --- UTILITY FUNCTIONS ---
 
 def url_decode(s):
     """Simple URL decoding for MicroPython, handles %XX and + for spaces."""
-    # Step 1: Handle '+' as space
-    s = s.replace('+', ' ')
-    
-    # Step 2: Handle %XX hex codes
-    new_s = ''
-    i = 0
-    while i < len(s):
-        if s[i] == '%' and (i + 2) < len(s):
+    # Split on '%' and accumulate into a bytearray: the old char-at-a-time
+    # 'new_s += c' loop reallocated the whole string on every append,
+    # which is quadratic on MicroPython. This is one pass with one
+    # allocation per %XX escape.
+    parts = s.replace('+', ' ').split('%')
+    out = bytearray(parts[0], 'utf-8')
+    for p in parts[1:]:
+        if len(p) >= 2:
             try:
-                # Extract the next two characters and convert hex to integer (ASCII code)
-                char_code = int(s[i+1:i+3], 16)
-                new_s += chr(char_code)
-                i += 3 # Move past %XX
+                # The two characters after '%' are a hex byte value.
+                out.append(int(p[:2], 16))
+                out.extend(p[2:].encode())
                 continue
             except ValueError:
-                # If %XX is invalid hex, treat % as a normal character
+                # Invalid hex: fall through and keep the '%' literally.
                 pass
-        
-        new_s += s[i]
-        i += 1
-        
-    return new_s
+        out.append(0x25)  # '%'
+        out.extend(p.encode())
+    return out.decode('utf-8')
+
+# Optional socket constant: the ESP32 lwIP module doesn't define
+# SO_RCVBUF at all, so the attribute itself has to be probed — a plain
+# socket.SO_RCVBUF raises AttributeError before setsockopt even runs.
+_SO_RCVBUF = getattr(socket, 'SO_RCVBUF', None)
+
+# Shared socket receive buffer. readinto() fills it in place, so request
+# reads allocate only the accumulated request itself, never a fresh
+# bytes object per recv. Single-threaded access only — both servers and
+# the weather fetch run from the main loop, never concurrently.
+_RECV_BUF = bytearray(1024)
+_RECV_MV = memoryview(_RECV_BUF)
+
+def read_http_request(conn):
+    """
+    Reads a complete HTTP request from a connection.
+
+    A single recv(1024) can truncate POST bodies (long SSIDs/API keys
+    plus URL-encoding push the config form past 1 KB), silently losing
+    settings. Read until the headers are complete, then honor
+    Content-Length so the whole body arrives.
+
+    Returns (request_bytes, header_end) — the raw request and the offset
+    of the header/body separator (-1 if it never arrived). The bytes are
+    handed to the callers undecoded: the header-end scan already happens
+    here while reading, so they can branch on the method and slice out
+    the body without re-scanning or decoding the whole buffer.
+    """
+    buf = _RECV_BUF
+    mv = _RECV_MV
+    n = conn.readinto(buf)
+    if not n:
+        return b'', -1
+    data = bytearray(mv[:n])
+
+    # Make sure we have the full header block. MicroPython's bytearray
+    # has no find(), so search a bytes snapshot of what has arrived —
+    # normally taken once, since the headers fit in the first recv.
+    header_end = bytes(data).find(b'\r\n\r\n')
+    while header_end == -1:
+        n = conn.readinto(buf)
+        if not n:
+            break
+        data.extend(mv[:n])
+        header_end = bytes(data).find(b'\r\n\r\n')
+
+    # Read the rest of the body if Content-Length says there is more.
+    if header_end != -1:
+        header = bytes(data[:header_end])
+        cl_start = header.find(b'Content-Length:')
+        if cl_start != -1:
+            cl_end = header.find(b'\r\n', cl_start)
+            if cl_end == -1:
+                cl_end = header_end  # Content-Length was the last header
+            try:
+                content_length = int(header[cl_start + 15:cl_end])
+            except ValueError:
+                content_length = 0
+            while len(data) - header_end - 4 < content_length:
+                n = conn.readinto(buf)
+                if not n:
+                    break
+                data.extend(mv[:n])
+
+    return data, header_end
+
+# Last successful weather result and the tick it arrived; re-entry
+# within the update interval returns this without touching the network
+# (OWM's free tier is rate-limited, so spurious refetches are doubly
+# wasted).
+_owm_cache = None
+_owm_cache_ts = 0
+
+# Resolved address of the OWM API host. getaddrinfo blocks on a DNS
+# round-trip (easily hundreds of ms); the record is stable, so resolve
+# once and only drop the cache when a connect to it actually fails.
+_owm_addr = None
 
 def fetch_weather_data(city_name, api_key, units):
     """
     Fetches temperature and city name from OpenWeatherMap API using raw sockets.
     Now uses City Name ('q' parameter) instead of City ID. (Fix 8)
     """
-    
-    if not network.WLAN(network.STA_IF).isconnected():
+    global _owm_cache, _owm_cache_ts, _owm_addr
+
+    if _owm_cache is not None and \
+            time.ticks_diff(time.ticks_ms(), _owm_cache_ts) < OWM_UPDATE_INTERVAL_MS:
+        return _owm_cache
+
+    if not sta_if.isconnected():
         print("OWM Fetch: Not connected to Wi-Fi.")
         return {"temp": None, "city": "N/A"}
         
@@ -163,24 +318,37 @@ def fetch_weather_data(city_name, api_key, units):
     path = "/data/2.5/weather?q={}&units={}&appid={}".format(city_name, units, api_key)
     
     try:
-        addr = socket.getaddrinfo(host, 80)[0][-1]
+        if _owm_addr is None:
+            _owm_addr = socket.getaddrinfo(host, 80)[0][-1]
         s = socket.socket()
-        s.connect(addr)
-        s.settimeout(5.0) # Set a timeout for the request
+        # Set the timeout before connecting so an unreachable API fails
+        # in 5 s instead of stalling on the full LwIP SYN timeout.
+        s.settimeout(5.0)
+        try:
+            s.connect(_owm_addr)
+        except OSError:
+            # Stale DNS (server moved, lease change): drop the cached
+            # address so the next attempt re-resolves.
+            _owm_addr = None
+            raise
 
         # Construct HTTP Request
         request = "GET {} HTTP/1.1\r\nHost: {}\r\nConnection: close\r\n\r\n".format(path, host)
         s.send(request.encode())
 
-        # Read Response Header and Content - Use larger buffer (512) for stability
-        response = b''
+        # Read Response Header and Content through the shared receive
+        # buffer: 'response += data' recopied the whole accumulated
+        # prefix on every chunk, while extend() grows one bytearray.
+        response = bytearray()
         while True:
-            data = s.recv(512)
-            if data:
-                response += data
-            else:
+            n = s.readinto(_RECV_BUF)
+            if not n:
                 break
+            response.extend(_RECV_MV[:n])
         s.close()
+        # MicroPython's bytearray has no find(); snapshot to bytes once
+        # (the same single copy recv() used to hand us) and scan that.
+        response = bytes(response)
 
         # Find the start of the JSON payload
         content_start = response.find(b'\r\n\r\n')
@@ -188,25 +356,57 @@ def fetch_weather_data(city_name, api_key, units):
             print("OWM Fetch: Invalid HTTP response (no header/body separator).")
             return {"temp": None, "city": "API ERROR - Header Missing"}
 
-        # Check HTTP Status Code (must be 200 OK)
-        status_line = response.split(b'\r\n')[0]
+        # Check HTTP Status Code (must be 200 OK). Slice just the status
+        # line instead of splitting the whole response into a list.
+        status_line = response[:response.find(b'\r\n')]
         if b'200 OK' not in status_line:
             print(f"OWM Fetch: HTTP Status Error: {status_line.decode()}")
             # If not 200, the payload is an error message (likely HTML), not JSON
             return {"temp": None, "city": "API ERROR - Bad Status"}
 
-        json_data = response[content_start + 4:].decode('utf-8')
-        
-        # This is where the syntax error usually happens if the response was truncated
-        data = json.loads(json_data) 
+        # Only two fields of the ~1 KB payload are used, so scan for them
+        # directly instead of materializing the whole dict tree (dozens
+        # of transient objects per fetch). The first "temp" in an OWM
+        # payload is main.temp. Anything unexpected falls back to a full
+        # json.loads.
+        body_start = content_start + 4
+        try:
+            i = response.find(b'"temp":', body_start)
+            if i < 0:
+                raise ValueError("no temp field")
+            i += 7
+            j = response.find(b',', i)
+            k = response.find(b'}', i)
+            if j < 0 or (k >= 0 and k < j):
+                j = k
+            temp = float(response[i:j].decode())
+
+            i = response.find(b'"name":"', body_start)
+            if i < 0:
+                raise ValueError("no name field")
+            i += 8
+            city_name = response[i:response.find(b'"', i)].decode()
+        except ValueError:
+            # json.loads takes the body bytes directly, with no
+            # str-decode copy in between. This is where the syntax error
+            # usually happens if the response was truncated.
+            data = json.loads(response[body_start:])
+            temp = data.get('main', {}).get('temp')
+            city_name = data.get('name', 'CITY') # City name returned by API
 
-        # Parse required data
-        temp = data.get('main', {}).get('temp')
-        city_name = data.get('name', 'CITY') # City name returned by API
-        
         print("OWM Data received: Temp={}, City={}".format(temp, city_name))
-        return {"temp": temp, "city": city_name}
-        
+        _owm_cache = {"temp": temp, "city": city_name}
+        _owm_cache_ts = time.ticks_ms()
+        if temp is not None:
+            # Best-effort persist so the next boot can render this value
+            # immediately instead of blocking on (and billing) a fetch.
+            try:
+                with open(OWM_CACHE_FILE, 'w') as f:
+                    json.dump({'temp': temp, 'city': city_name, 'ts': time.time()}, f)
+            except OSError:
+                pass
+        return _owm_cache
+
     except Exception as e:
         print("OWM Fetch Error:", e)
         # If we hit a JSON syntax error, it's either truncation or a very unexpected error body.
@@ -248,28 +448,54 @@ def load_wifi_config():
 def save_wifi_config(ssid, password, owm_key, owm_city_name, owm_units):
     """Saves all configuration data to file."""
     data = {
-        'ssid': ssid, 
+        'ssid': ssid,
         'password': password,
         'owm_key': owm_key,
         'owm_city_name': owm_city_name,
         'owm_units': owm_units
     }
-    with open(WIFI_CONFIG_FILE, 'w') as f:
+    # Re-saving identical settings (e.g. the user only pressed Save) is a
+    # no-op: skip the flash erase/write cycle entirely.
+    if data == device_config:
+        return
+
+    # Write to a temp file and rename over the old one. rename is atomic
+    # on the VFS, so a power loss mid-save leaves the previous config
+    # readable instead of a truncated JSON file that load_wifi_config
+    # would discard along with the stored credentials.
+    tmp_file = WIFI_CONFIG_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
         json.dump(data, f)
+    try:
+        os.rename(tmp_file, WIFI_CONFIG_FILE)
+    except OSError:
+        # FAT VFS refuses to rename over an existing file (EEXIST);
+        # only littlefs replaces the destination atomically. Remove then
+        # rename there — if power dies in that small window, the .tmp
+        # file still holds a complete copy of the new config.
+        os.remove(WIFI_CONFIG_FILE)
+        os.rename(tmp_file, WIFI_CONFIG_FILE)
 
 def setup_sta_server(ip):
     """Sets up and returns a non-blocking socket server on the station interface."""
-    global sta_server_socket
+    global sta_server_socket, sta_poller
     if sta_server_socket is not None:
         return sta_server_socket # Already set up
 
     try:
         addr = socket.getaddrinfo(ip, 80)[0][-1]
         s = socket.socket()
+        # Reuse the port immediately after a soft reset instead of failing
+        # with EADDRINUSE while lwIP holds the old socket in TIME_WAIT.
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         s.bind(addr)
         s.listen(1)
         # Set to non-blocking so s.accept() returns immediately if no connection is pending.
-        s.setblocking(False) 
+        s.setblocking(False)
+        # Register with a poller so the main loop can check for pending
+        # connections without paying for an EAGAIN exception per pass.
+        sta_poller = uselect.poll()
+        sta_poller.register(s, uselect.POLLIN)
         print(f"STA Web server listening on {ip}:80 for config changes.")
         sta_server_socket = s
         return s
@@ -283,71 +509,76 @@ def handle_config_requests(s):
     if s is None:
         return
 
-    conn = None # Initialize connection outside the try block
+    # Accept is guarded on its own: a failure here means there is no
+    # connection to close, and it must not be mistaken for (or masked by)
+    # an error while handling one.
     try:
-        # Check if there is a connection waiting (non-blocking)
         conn, addr = s.accept()
-        conn.settimeout(3.0) 
-        
-        request_bytes = conn.recv(1024)
-        request_str = request_bytes.decode('utf-8') 
-        
-        if request_str.find('POST /') != -1:
-            # Handle POST request (saving new configuration)
-            content_start = request_str.find('\r\n\r\n') + 4
-            post_data_raw = request_str[content_start:].strip()
-            
-            data = {}
-            for item in post_data_raw.split('&'):
-                try:
-                    key, value = item.split('=')
-                    data[key] = url_decode(value) 
-                except ValueError:
-                    continue 
-            
-            # Use current config for fallback if fields are empty
-            current_config = load_wifi_config()
-
-            # The form requires SSID and Password, so we take those if available
-            ssid = data.get('ssid', current_config['ssid'])
-            password = data.get('password', current_config['password'])
-
-            # OWM fields can be blank if user only updates WiFi (or vice versa)
-            owm_key = data.get('owm_key', current_config['owm_key'])
-            owm_city_name = data.get('owm_city_name', current_config['owm_city_name'])
-            owm_units = data.get('owm_units', current_config['owm_units'])
-            
-            # Save the new configuration and update the runtime config
-            save_wifi_config(ssid, password, owm_key, owm_city_name, owm_units)
-            device_config = load_wifi_config() # Reload global config
+    except OSError as e:
+        # Error 11: EWOULDBLOCK / EAGAIN (no connection pending on the
+        # non-blocking listener).
+        if e.args[0] != 11:
+            print("Socket accept error:", e)
+        return
+
+    try:
+        conn.settimeout(3.0)
+        # Disable Nagle so the small response goes out in one segment
+        # instead of waiting for lwIP's coalescing timer.
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if _SO_RCVBUF is not None:
+            try:
+                # Requests are ~1 KB; a small receive window keeps lwIP
+                # from reserving full-size pbuf chains per connection.
+                conn.setsockopt(socket.SOL_SOCKET, _SO_RCVBUF, 2048)
+            except OSError:
+                pass # constant defined but option rejected
+
+        request, header_end = read_http_request(conn)
+
+        if header_end != -1 and request[:5] == b'POST ':
+            # Handle POST request (saving new configuration). Only the
+            # small form body is decoded, not the whole request. The
+            # method check is a slice compare because MicroPython's
+            # bytearray has no startswith (and no strip — hence the
+            # strip after decoding).
+            post_data_raw = request[header_end + 4:].decode('utf-8').strip()
+
+            # One comprehension instead of a tokenizing loop with a
+            # try/except per field; maxsplit=1 keeps values that contain
+            # '=' (e.g. in passwords) intact instead of dropping them.
+            data = {k: url_decode(v)
+                    for k, v in (item.split('=', 1)
+                                 for item in post_data_raw.split('&')
+                                 if '=' in item)}
+
+            # Merge the posted fields over the in-memory config (it is
+            # authoritative, no need to re-read flash); any field the form
+            # left out keeps its current value.
+            new_config = {k: data.get(k, device_config[k]) for k in _CONFIG_FIELDS}
+
+            # Save the new configuration and update the runtime config in
+            # place (avoids a second flash read + JSON parse per save).
+            save_wifi_config(**new_config)
+            device_config.update(new_config)
 
             # Response and reboot
-            response = "HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n"
-            response += "<h1>Configuration saved!</h1><p>The device is rebooting to apply changes.</p>"
-            conn.send(response.encode())
-            # conn.close() will be executed outside the if/else block below on success
+            conn.sendall(_RESP_SAVED_REBOOT)
 
-        else:
+        elif request:
             # Handle GET request (serving the config form)
-            response = 'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n' + get_config_html(device_config)
-            conn.send(response.encode())
-        
-        # SUCCESSFUL completion: Close the connection
-        conn.close()
+            send_config_html(conn, device_config)
 
     except OSError as e:
-        # Error 11: EWOULDBLOCK / EAGAIN (Expected when using s.settimeout(0.1) and no connection is waiting)
-        if e.args[0] == 11: 
-            pass 
-        else:
-            # Other socket errors (e.g., connection reset by peer, timeout)
-            print("Socket error during handling:", e)
-            if conn:
-                conn.close()
+        # Socket errors (e.g., connection reset by peer, timeout)
+        print("Socket error during handling:", e)
     except Exception as e:
         print("An unexpected error occurred during request handling:", e)
-        if conn:
+    finally:
+        try:
             conn.close()
+        except Exception:
+            pass
 
 def start_config_portal(matrix):
     """
@@ -362,7 +593,7 @@ def start_config_portal(matrix):
     hub75spi.display_data()
 
     # Configure as Access Point
-    ap = network.WLAN(network.AP_IF)
+    ap = ap_if
     ap.active(True)
     ap.config(essid=AP_SSID, password=AP_PASSWORD)
     print(f"AP started: {AP_SSID} (IP: {ap.ifconfig()[0]})")
@@ -370,112 +601,136 @@ def start_config_portal(matrix):
     # Start the web server (Blocking loop is fine here as nothing else runs)
     addr = socket.getaddrinfo('0.0.0.0', 80)[0][-1]
     s = socket.socket()
+    # Reuse the port straight away if the portal restarts; lwIP otherwise
+    # keeps it in TIME_WAIT and bind() fails with EADDRINUSE.
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     s.bind(addr)
     s.listen(1)
     print("Web server listening on port 80...")
 
+    # Load once, outside the request loop; the device reboots after a
+    # successful save, so the file cannot change underneath the portal.
+    current_config = load_wifi_config()
+
     while True:
         hub75spi.display_data()
         
-        conn = None # Initialize connection here for AP mode
+        # Accept on its own so an accept failure is not confused with (or
+        # masked by) an error on a live connection.
         try:
             # AP mode server is blocking here, which is fine as nothing else is running
             conn, addr = s.accept()
+        except OSError as e:
+            if e.args[0] != 110 and e.args[0] != 113: # Timeout errors
+                print("AP Socket accept error:", e)
+            continue
+
+        try:
             conn.settimeout(5.0) # Set timeout on accepted connection
-            request_bytes = conn.recv(1024)
-            request_str = request_bytes.decode('utf-8') 
-            
-            # Use current config for pre-filling HTML and fallback during POST
-            current_config = load_wifi_config()
-            
-            if request_str.find('POST /') != -1:
-                content_start = request_str.find('\r\n\r\n') + 4
-                post_data_raw = request_str[content_start:].strip()
-                
-                data = {}
-                for item in post_data_raw.split('&'):
-                    try:
-                        key, value = item.split('=')
-                        data[key] = url_decode(value) 
-                    except ValueError:
-                        continue 
-                
-                # Extract all fields
-                ssid = data.get('ssid', current_config['ssid'])
-                password = data.get('password', current_config['password'])
-                owm_key = data.get('owm_key', current_config['owm_key'])
-                owm_city_name = data.get('owm_city_name', current_config['owm_city_name'])
-                owm_units = data.get('owm_units', current_config['owm_units'])
-                
-                if ssid and password:
-                    save_wifi_config(ssid, password, owm_key, owm_city_name, owm_units)
-                    
-                    response = "HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n"
-                    response += "<h1>Credentials saved!</h1><p>The device is rebooting to connect.</p>"
-                    conn.sendall(response.encode())
-                    time.sleep_ms(50) 
-                    conn.close()
-                    time.sleep(1) 
-                    ap.active(False) 
-                    machine.reset()
+            # Flush small responses immediately rather than letting Nagle
+            # hold them for a coalescing window.
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if _SO_RCVBUF is not None:
+                try:
+                    # Same small receive window as the STA server.
+                    conn.setsockopt(socket.SOL_SOCKET, _SO_RCVBUF, 2048)
+                except OSError:
+                    pass
+
+            # Serve successive requests on the same connection: HTTP/1.1
+            # defaults to keep-alive and the config page carries a
+            # Content-Length, so the browser's follow-up GETs reuse this
+            # socket instead of paying a TCP handshake each. The loop ends
+            # when the peer closes, the idle timeout fires, or we send a
+            # Connection: close response (the 400 page).
+            while True:
+                request, header_end = read_http_request(conn)
+                if not request:
+                    break # peer closed the connection
+
+                # Slice compare / decode-then-strip: see the note in the
+                # STA handler about MicroPython's bytearray methods.
+                if header_end != -1 and request[:5] == b'POST ':
+                    post_data_raw = request[header_end + 4:].decode('utf-8').strip()
+
+                    # Same one-pass parse as the STA handler; see the note
+                    # there about maxsplit=1.
+                    data = {k: url_decode(v)
+                            for k, v in (item.split('=', 1)
+                                         for item in post_data_raw.split('&')
+                                         if '=' in item)}
+
+                    # Merge the posted fields over the loaded config.
+                    new_config = {k: data.get(k, current_config[k]) for k in _CONFIG_FIELDS}
+
+                    if new_config['ssid'] and new_config['password']:
+                        save_wifi_config(**new_config)
+
+                        # No flush sleep needed: sendall has handed the
+                        # framed response to the stack, which keeps
+                        # transmitting through the graceful close below.
+                        conn.sendall(_RESP_CREDS_SAVED)
+                        conn.close()
+                        time.sleep(1)
+                        ap.active(False)
+                        machine.reset()
+                    else:
+                        print("Error: Missing SSID or Password in parsed data.")
+                        conn.sendall(_RESP_BAD_REQUEST)
+                        break
+
                 else:
-                    print("Error: Missing SSID or Password in parsed data.")
-                    conn.send("HTTP/1.1 400 Bad Request\r\nContent-Type: text/html\r\n\r\n<h1>Missing SSID or Password</h1>".encode())
-                    time.sleep_ms(50) 
-                    conn.close()
+                    # Handle GET request (serving the config form)
+                    send_config_html(conn, current_config)
 
-            else:
-                # Handle GET request (serving the config form)
-                html_content = get_config_html(current_config)
-                content_length = len(html_content.encode('utf-8'))
-                
-                response = 'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: {}\r\n\r\n{}'.format(content_length, html_content)
-
-                conn.sendall(response.encode())
-                time.sleep_ms(50) 
-                conn.close()
-            
         except OSError as e:
             # Handle socket errors
-            if e.args[0] == 110 or e.args[0] == 113: # Timeout errors
-                pass 
+            if e.args[0] == 110 or e.args[0] == 113: # Timeout errors (idle keep-alive)
+                pass
             else:
                 print("AP Socket unexpected error:", e)
-                
+
         except Exception as e:
             print("An unexpected error occurred in AP server:", e)
-            
+
         finally:
             # Fix 5: Ensure connection is closed after processing or error.
-            if conn:
-                try:
-                    conn.close()
-                except Exception:
-                    # Ignore errors on trying to close an already closed/invalid socket
-                    pass
+            try:
+                conn.close()
+            except Exception:
+                # Ignore errors on trying to close an already closed/invalid socket
+                pass
 
 
 def connect_to_wifi(config):
     """Attempts to connect to the given Wi-Fi network."""
     global ip_address
-    wlan = network.WLAN(network.STA_IF)
+    wlan = sta_if
     wlan.active(True)
     wlan.connect(config['ssid'], config['password'])
-    
-    timeout = 15 # Give up to 15 seconds to connect
-    while timeout > 0:
+
+    # Draw the status screen once; the wait loop only refreshes the panel.
+    matrix.clear_all_bytes()
+    draw_text(matrix, font_spectrum, "Connecting...", x=1, y=5, color=COLOR_BLUE)
+
+    # Poll every 100 ms instead of sleeping whole seconds: a connect that
+    # lands at 2.3 s returns at 2.3 s, not 3 s, and a definitive failure
+    # (bad password, AP not found) bails out instead of burning the full
+    # 15 s window.
+    deadline = time.ticks_add(time.ticks_ms(), 15000)
+    while time.ticks_diff(deadline, time.ticks_ms()) > 0:
         if wlan.isconnected():
             ip_address = wlan.ifconfig()[0]
             print('Wi-Fi connected:', ip_address)
             return True
-        time.sleep(1)
-        timeout -= 1
-        
-        matrix.clear_all_bytes()
-        draw_text(matrix, font_spectrum, "Connecting...", x=1, y=5, color=COLOR_BLUE)
+        status = wlan.status()
+        if status == network.STAT_WRONG_PASSWORD or status == network.STAT_NO_AP_FOUND:
+            print('Wi-Fi connect failed, status:', status)
+            break
         hub75spi.display_data()
+        time.sleep_ms(100)
 
-    wlan.active(False) 
+    wlan.active(False)
     return False
 
 # --- MAIN EXECUTION FLOW ---
@@ -493,52 +748,161 @@ else:
     # 1B. If connected, start the non-blocking web server on the STA IP
     setup_sta_server(ip_address)
     
+# Seed the weather state from the previous run's cache: the first
+# render shows a real temperature right away, and if the cached fetch is
+# still fresh the first API call (rate-limited on the free tier) is
+# pushed out by the remainder of the interval. The freshness check only
+# holds when the clock survived the reboot (RTC-backed or NTP-synced);
+# a nonsensical age just means we fetch immediately, as before.
+try:
+    with open(OWM_CACHE_FILE, 'r') as f:
+        _cached_owm = json.load(f)
+    if _cached_owm['temp'] is not None:
+        external_temp = _cached_owm['temp']
+        owm_data = {"temp": external_temp, "city": _cached_owm['city']}
+        age_ms = int((time.time() - _cached_owm['ts']) * 1000)
+        if 0 <= age_ms < OWM_UPDATE_INTERVAL_MS:
+            next_owm_deadline = time.ticks_add(
+                time.ticks_ms(), OWM_UPDATE_INTERVAL_MS - age_ms)
+except (OSError, ValueError, KeyError, TypeError):
+    pass # no cache yet (or unreadable): first fetch happens immediately
+
 # Initialize the DHT22 sensor object.
 dht_sensor = dht.DHT22(machine.Pin(DHT22_PIN, machine.Pin.IN, machine.Pin.PULL_UP))
 
+# Schedule sensor reads from a hardware timer instead of comparing
+# tick counters every loop pass. The callback runs in IRQ context, so
+# it only sets a flag; the ~20 ms blocking read itself still happens
+# in the main loop where it can't corrupt IRQ state.
+dht_read_due = True  # read once immediately at startup
+
+def _schedule_dht_read(t):
+    global dht_read_due
+    dht_read_due = True
+
+dht_timer = machine.Timer(-1)
+dht_timer.init(period=UPDATE_INTERVAL_MS, mode=machine.Timer.PERIODIC, callback=_schedule_dht_read)
+
+# Settle the heap before entering the loop: sweep the boot-time garbage
+# (config portal buffers, parsed JSON, interned setup strings) now, then
+# set a threshold so later collections trigger early on a mostly-empty
+# heap and stay short, instead of stop-the-world sweeps of a full heap
+# mid-frame. The ESP32 port has no gc.freeze, so the threshold is the
+# available lever.
+gc.collect()
+gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+
 # The main loop now handles the sensor readings and display updates.
+last_drawn_text = None  # Last text rendered into the matrix buffer
+last_text_end = 0  # Cursor x returned by the last draw_text call
+
+# DHT failure backoff: a bit-banged read of a dead/disconnected sensor
+# blocks the loop for up to a second, so repeated OSErrors stretch the
+# retry window instead of stalling the display every interval.
+dht_fail_count = 0
+dht_next_try = 0  # ticks_ms deadline; 0 allows the initial read
+
+# Bind the per-iteration calls to plain names before the loop: at module
+# scope these are still globals, but a single dict probe replaces the
+# module + attribute chain (two lookups) on every access.
+_ticks_ms = time.ticks_ms
+_ticks_diff = time.ticks_diff
+_sleep_ms = time.sleep_ms
+_display_data = hub75spi.display_data
+
 while True:
     # Get the current time in milliseconds
-    current_time = time.ticks_ms()
-
-    # Check if 2 seconds have passed since the last sensor reading.
-    if time.ticks_diff(current_time, last_update) >= UPDATE_INTERVAL_MS:
-        try:
-            # Read data from the DHT22 sensor
-            dht_sensor.measure()
-            temperature = dht_sensor.temperature()
-            humidity = dht_sensor.humidity()
-            room_temp = (temperature * 9 / 5) + 32
-
-            # Update the last_update time to the current time
-            last_update = current_time
-            
-        except OSError as e:
-            # Handle cases where the sensor read fails, and set an error message.
-            display_text = "Sensor Error"
-            print("Error reading sensor:", e)
+    current_time = _ticks_ms()
+
+    # Read the sensor when the timer callback has flagged it as due.
+    if dht_read_due:
+        # Clear the flag before measuring so a failed read waits for the
+        # next timer tick instead of retrying every loop iteration (the
+        # sensor can't be polled faster than ~2s anyway).
+        dht_read_due = False
+        # Skip the read entirely while backing off from failures; the
+        # timer keeps raising the flag, but a dead sensor only gets one
+        # blocking read attempt per backoff window (up to a minute).
+        if _ticks_diff(current_time, dht_next_try) >= 0:
+            try:
+                # Read data from the DHT22 sensor
+                dht_sensor.measure()
+                temperature = dht_sensor.temperature()
+                humidity = dht_sensor.humidity()
+                room_temp = (temperature * 9 / 5) + 32
+                display_text = "{:.0f}/{:.0f}F".format(room_temp, external_temp)
+                dht_fail_count = 0
+
+            except OSError as e:
+                # Handle cases where the sensor read fails, and set an error message.
+                display_text = "Sensor Error"
+                print("Error reading sensor:", e)
+                dht_fail_count += 1
+                dht_next_try = time.ticks_add(
+                    current_time,
+                    min(60000, UPDATE_INTERVAL_MS << min(dht_fail_count, 4)))
     # --- 2. OWM DATA FETCH (Less frequent) ---
-    if time.ticks_diff(current_time, last_owm_update) >= OWM_UPDATE_INTERVAL_MS:
+    # Deadline-style scheduling: compare against an absolute next-run
+    # tick instead of re-deriving an elapsed interval each pass, and
+    # reschedule with ticks_add (wraparound-safe).
+    if _ticks_diff(current_time, next_owm_deadline) >= 0:
         owm_data = fetch_weather_data(
-            device_config['owm_city_name'], 
-            device_config['owm_key'], 
+            device_config['owm_city_name'],
+            device_config['owm_key'],
             device_config['owm_units']
         )
-        external_temp = owm_data['temp'] if owm_data['temp'] is not None else 0.0
-        last_owm_update = current_time
-    
-    display_text = "{:.0f}/{:.0f}F".format(
-        room_temp, 
-        external_temp
-    )
-    # Clear the display before drawing new text to prevent ghosting
-    matrix.clear_all_bytes()
-    
-    # Draw the text to the buffer. This happens continuously.
-    draw_text(matrix, font_spectrum, display_text, x=1, y=1, color=7)
-    
-    # Send the updated buffer to the physical display in one go.
-    # This happens continuously, even when the sensor is not being read.
-    hub75spi.display_data()
-
-    time.sleep_ms(1)  # Small delay to prevent CPU overload
+        if owm_data['temp'] is not None:
+            external_temp = owm_data['temp']
+            owm_failures = 0
+            next_owm_deadline = time.ticks_add(current_time, OWM_UPDATE_INTERVAL_MS)
+        else:
+            # Back off exponentially on failure so flaky Wi-Fi or a down
+            # API doesn't freeze the loop on a blocked socket every
+            # interval; a success resets the cadence.
+            external_temp = 0.0
+            owm_failures += 1
+            next_owm_deadline = time.ticks_add(
+                current_time,
+                min(OWM_BACKOFF_MAX_MS, OWM_UPDATE_INTERVAL_MS << min(owm_failures, 6)))
+        # Either temperature may have changed; reformat here rather than
+        # every pass — the old unconditional format allocated a fresh str
+        # hundreds of times a second just to compare it equal.
+        display_text = "{:.0f}/{:.0f}F".format(room_temp, external_temp)
+
+    # Only redraw the buffer when the text actually changed; the readings
+    # update every few seconds while the loop spins far faster, so the
+    # clear + glyph rendering is wasted work on almost every iteration.
+    if display_text != last_drawn_text:
+        # Clear the band the previous text occupied before drawing, to
+        # prevent ghosting. Glyphs are 8 rows tall and the band width is
+        # the cursor position the previous draw_text returned — the
+        # actual rendered extent, not a per-character guess — so it is
+        # still a fraction of the full-buffer wipe. The first pass
+        # clears everything to take down the boot/status screens.
+        if last_drawn_text is None:
+            matrix.clear_all_bytes()
+        else:
+            matrix.clear_rect(1, 1, 8, last_text_end - 1)
+        last_text_end = draw_text(matrix, font_spectrum, display_text, x=1, y=1, color=7)
+        last_drawn_text = display_text
+
+    # Send the buffer to the physical display. This must happen
+    # continuously — the HUB75 panel only lights while being scanned.
+    _display_data()
+
+    # Wait on the server socket instead of sleeping blind: the poll
+    # timeout doubles as the loop's pacing delay, and a pending
+    # connection wakes us immediately instead of after the sleep. The
+    # wait is bounded by the next weather deadline and capped at 10 ms
+    # so the panel refresh keeps a solid cadence; the DHT timer needs no
+    # wakeup since its flag is checked at the top of every pass.
+    if sta_poller is not None:
+        wait_ms = _ticks_diff(next_owm_deadline, current_time)
+        if wait_ms < 1:
+            wait_ms = 1
+        elif wait_ms > 10:
+            wait_ms = 10
+        if sta_poller.poll(wait_ms):
+            handle_config_requests(sta_server_socket)
+    else:
+        _sleep_ms(1)  # Small delay to prevent CPU overload
@@ -0,0 +1,28 @@
+# Frozen-module manifest for building the clock into MicroPython firmware.
+#
+# Freezing moves the library bytecode and the font tables into flash, so
+# the interpreter executes them from ROM instead of loading .py sources
+# onto the heap at boot — the font dicts alone are the largest RAM cost
+# of this project. Build with:
+#
+#   make BOARD=GENERIC FROZEN_MANIFEST=/path/to/this/manifest.py
+#
+# main.py and wifi_config.json stay on the filesystem so they remain
+# editable without reflashing.
+
+include("$(PORT_DIR)/boards/manifest.py")
+
+freeze(
+    ".",
+    (
+        "hub75.py",
+        "matrixdata.py",
+        "draw_text.py",
+        "font.py",
+        "ds1307.py",
+        "i2c_scanner.py",
+        "bouncer.py",
+        "logo.py",
+        "planets.py",
+    ),
+)
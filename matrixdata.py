@@ -1,6 +1,10 @@
-BLUE_VALUE = 1
-GREEN_VALUE = 2
-RED_VALUE = 4
+from micropython import const
+
+# Channel bit masks; const() lets the compiler fold them into bytecode
+# instead of doing a module-dict lookup per set_pixel_value call.
+BLUE_VALUE = const(1)
+GREEN_VALUE = const(2)
+RED_VALUE = const(4)
 
 class MatrixData:
     '''
@@ -15,6 +19,10 @@ class MatrixData:
         Magenta 0b101         5
         Yellow  0b110         6
         White   0b111         7
+
+    Storage is already bit-packed: one bit per channel per pixel, held in
+    a bytearray of col_size // 8 bytes per row for each of the three
+    channel planes (768 bytes total for a 64x32 panel).
     '''
     def __init__(self, row_size, col_size, record_dirty_bytes=True):
         self.row_size = row_size
@@ -25,6 +33,9 @@ class MatrixData:
         self.green_matrix_data = [bytearray(self.col_bytes) for x in range(self.row_size)]
         self.blue_matrix_data = [bytearray(self.col_bytes) for x in range(self.row_size)]
 
+        # Cached zero row for memset-style clears (see clear_all_bytes).
+        self._zero_row = bytes(self.col_bytes)
+
         self.record_dirty_bytes = record_dirty_bytes
         if self.record_dirty_bytes:
             self.dirty_bytes_set = set()
@@ -124,6 +135,51 @@ class MatrixData:
 
         self.dirty_bytes_set = set()
 
+    def clear_rect(self, row, col, num_rows, num_cols):
+        '''
+        Reset a rectangular region of pixels.
+
+        The region is expanded to whole bytes horizontally, so pixels
+        sharing a byte with the region's edge columns are cleared too;
+        callers clearing a text band won't notice, as each row is wiped
+        with one slice assignment per plane.
+
+        Parameters
+        ----------
+        row : int
+            Top row of the region.
+        col : int
+            Left column of the region.
+        num_rows : int
+            Height of the region in pixels.
+        num_cols : int
+            Width of the region in pixels.
+
+        Returns
+        -------
+        None.
+        '''
+        row_start = 0 if row < 0 else row
+        row_end = min(self.row_size, row + num_rows)
+        col_start = 0 if col < 0 else col
+        col_end = min(self.col_size, col + num_cols)
+        if row_start >= row_end or col_start >= col_end:
+            return
+
+        byte_start = col_start >> 3
+        byte_end = ((col_end - 1) >> 3) + 1
+        zero = self._zero_row[byte_start:byte_end]
+        for r in range(row_start, row_end):
+            self.red_matrix_data[r][byte_start:byte_end] = zero
+            self.green_matrix_data[r][byte_start:byte_end] = zero
+            self.blue_matrix_data[r][byte_start:byte_end] = zero
+
+        if self.record_dirty_bytes:
+            discard = self.dirty_bytes_set.discard
+            for r in range(row_start, row_end):
+                for b in range(byte_start, byte_end):
+                    discard((r, b))
+
     def clear_all_bytes(self):
         '''
         Reset all pixels.
@@ -132,9 +188,15 @@ class MatrixData:
         -------
         None.
         '''
-        self.red_matrix_data = [bytearray(self.col_bytes) for x in range(self.row_size)]
-        self.green_matrix_data = [bytearray(self.col_bytes) for x in range(self.row_size)]
-        self.blue_matrix_data = [bytearray(self.col_bytes) for x in range(self.row_size)]
+        # Zero the existing rows in place via slice assignment (a C-level
+        # copy) instead of reallocating 3 * row_size fresh bytearrays.
+        zero_row = self._zero_row
+        for row in self.red_matrix_data:
+            row[:] = zero_row
+        for row in self.green_matrix_data:
+            row[:] = zero_row
+        for row in self.blue_matrix_data:
+            row[:] = zero_row
 
         if self.record_dirty_bytes:
             self.dirty_bytes_set = set()
\ No newline at end of file